@@ -1,5 +1,7 @@
+from collections import namedtuple
 from datetime import datetime
-from typing import Union, List
+from functools import lru_cache
+from typing import Union, List, Tuple
 
 from sqlalchemy import inspect, Date, DateTime
 from sqlalchemy.orm import declarative_base
@@ -11,10 +13,12 @@ BaseEntity = declarative_base()
 """Declaración de clase para mapeo de todas la entidades de la base de datos."""
 
 
+@lru_cache(maxsize=None)
 def find_entity_id_field_name(entity_type: type(BaseEntity)) -> Union[str, List[str]]:
     """
     Devuelve el nombre del campo de la clave primaria de la entidad. Puede devolver un listado de strings si
-    tuviese más de una, como por ejemplo el caso de los modelos de relaciones n a m.
+    tuviese más de una, como por ejemplo el caso de los modelos de relaciones n a m. La clave primaria de una entidad no
+    cambia, así que el resultado se cachea por tipo: el listado devuelto es compartido y no debe modificarse.
     :param entity_type: Tipo de la entidad, siempre y cuando herede de BaseEntity.
     :return: Nombre del campo id de la entidad, o un listado de strings para el caso de entidades con más de una pk.
     """
@@ -85,12 +89,9 @@ def set_model_properties_by_dict(entity: BaseEntity, model_dict: dict, only_set_
             # Si es una entidad mn, voy añadiendo registros al listado
             if is_many_to_many or is_one_to_many:
                 if rel.key in model_dict and model_dict[rel.key]:
-                    # Inicializo la lista
-                    setattr(entity, rel.key, [])
-                    # Añado elementos
-                    att = getattr(entity, rel.key)
-                    for i in model_dict[rel.key]:
-                        att.append(deserialize_model(i, rel.entity.class_))
+                    # Construyo la lista completa y la asigno de una vez: cada append sobre la colección
+                    # instrumentada dispara los eventos de SQLAlchemy.
+                    setattr(entity, rel.key, [deserialize_model(i, rel.entity.class_) for i in model_dict[rel.key]])
 
                 continue
 
@@ -132,90 +133,107 @@ def set_model_properties_by_dict(entity: BaseEntity, model_dict: dict, only_set_
                             setattr(entity, related_key, None)
 
 
-def serialize_model(model: BaseEntity) -> dict:
+_SerializationPlan = namedtuple('SerializationPlan', ['columns', 'foreign_key_names', 'collection_relationships',
+                                                        'scalar_relationships'])
+"""Información de una entidad necesaria para serializarla: columnas (nombre, es fecha), nombres de las foreign keys,
+relaciones one-to-many/many-to-many y relaciones a uno (nombre, foreign key local, nombre del id de la entidad
+relacionada)."""
+
+
+@lru_cache(maxsize=None)
+def _get_serialization_plan(entity_type: type(BaseEntity)) -> _SerializationPlan:
     """
-    Convierte a json un modelo de SQLAlchemy.
-    :return: dicctionario de datos de la entidad.
+    Calcula qué hay que leer de una entidad para serializarla. Sólo depende del tipo, así que se recorren las columnas y
+    relaciones del mapper una sola vez por tipo de entidad en lugar de una vez por registro.
+    :param entity_type: Tipo de entidad.
+    :return: _SerializationPlan
     """
-    json_dict: dict = {}
+    columns: List[Tuple[str, bool]] = []
     # Almaceno las foreign keys para el caso de entidades lazyload distintas de null. Devolveré un diccionario con el id
     # de la entidad al menos.
-    foreign_key_names: list = []
+    foreign_key_names: List[str] = []
 
-    column_type: any
-    column_value: any
-    columns = model.__table__.columns
-    for column in columns:
+    for column in entity_type.__table__.columns:
         # Las columnas de tipo foreign_key no las quiero exportar
-        if getattr(type(model), column.name).foreign_keys:
+        if getattr(entity_type, column.name).foreign_keys:
             foreign_key_names.append(column.name)
             continue
 
-        column_type = column.type
-        column_value = getattr(model, column.name)
+        # Compruebo si es una fecha: en ese caso hay que serializarlo como string
+        columns.append((column.name, isinstance(column.type, (Date, DateTime))))
 
-        # Comprobar si es una fecha: en ese caso hay que serializarlo como string
-        if (isinstance(column_type, Date) or isinstance(column_type, DateTime)) and isinstance(column_value, datetime):
-            json_dict[column.name] = format_date(column_value, EnumDateFormatTypes.YEAR_MONTH_DAY_HH_MM_SS)
-        else:
-            # Añado clave-valor al diccionario
-            json_dict[column.name] = column_value
+    collection_relationships: List[str] = []
+    scalar_relationships: List[Tuple[str, Union[str, None], Union[str, List[str]]]] = []
+    mapper = entity_type.__mapper__
+    local_key: Union[str, None]
 
-    # Obtener relaciones del modelo
-    relationships = model.__mapper__.relationships
+    for rel in mapper.relationships:
+        # Si es una relación one_to_many o mm, es un listado de objetos.
+        if rel.direction is not None and rel.direction in (symbol("MANYTOMANY"), symbol("ONETOMANY")):
+            collection_relationships.append(rel.key)
+            continue
 
-    if relationships:
-        # Compruebo las entidades no cargadas para evitar lazyloads
-        ins = inspect(model)
-
-        attr: any
-        local_key: str
-        # Este diccionario es para devolver algo en las entidades lazy, el id por lo menos aunque el resto no
-        # esté definido
-        lazyload_dict: dict
-        is_many_to_many: bool
-        is_one_to_many: bool
+        # Busco la foreing key asociada a la relación, para el caso de que no esté cargada
+        local_key = None
+        for lcl in rel.local_columns:
+            if mapper.get_property_by_column(lcl).key in foreign_key_names:
+                local_key = mapper.get_property_by_column(lcl).key
+                break
 
-        for rel in relationships:
-            # Comprobar si es una relación many-many o one-to-many
-            is_many_to_many = rel.direction is not None and rel.direction == symbol("MANYTOMANY")
-            is_one_to_many = rel.direction is not None and rel.direction == symbol("ONETOMANY")
+        # OJO!!! NO debería llegar nada aquí con más de una clave primaria, find_entity_id_field_name puede devolver
+        # una lista de strings pero no debería llegar hasta aquí ese caso porque ya estoy controlando las entidades
+        # many to many.
+        scalar_relationships.append((rel.key, local_key, find_entity_id_field_name(rel.mapper.class_)))
 
-            # Si es una relación one_to_many o mm, es un listado de objetos. Añadimos un diccionario por cada
-            # elemento contenido.
-            if is_many_to_many or is_one_to_many:
-                attr = getattr(model, rel.key)
+    return _SerializationPlan(columns=tuple(columns), foreign_key_names=tuple(foreign_key_names),
+                              collection_relationships=tuple(collection_relationships),
+                              scalar_relationships=tuple(scalar_relationships))
 
-                if attr:
-                    json_dict[rel.key] = []
-                    for i in attr:
-                        json_dict[rel.key].append(serialize_model(i))
 
-                continue
+def serialize_model(model: BaseEntity) -> dict:
+    """
+    Convierte a json un modelo de SQLAlchemy.
+    :return: dicctionario de datos de la entidad.
+    """
+    json_dict: dict = {}
+    plan: _SerializationPlan = _get_serialization_plan(type(model))
 
+    # Compruebo los atributos no cargados para evitar lazyloads. Las columnas que no se hayan cargado en la consulta
+    # (por ejemplo, con load_only) se serializan como None.
+    unloaded = inspect(model).unloaded
+
+    column_value: any
+    for column_name, is_date in plan.columns:
+        column_value = getattr(model, column_name) if column_name not in unloaded else None
+
+        # Las fechas hay que serializarlas como string
+        if is_date and isinstance(column_value, datetime):
+            json_dict[column_name] = format_date(column_value, EnumDateFormatTypes.YEAR_MONTH_DAY_HH_MM_SS)
+        else:
+            # Añado clave-valor al diccionario
+            json_dict[column_name] = column_value
+
+    attr: any
+    # Si es una relación one_to_many o mm, es un listado de objetos. Añadimos un diccionario por cada elemento
+    # contenido.
+    for rel_key in plan.collection_relationships:
+        attr = getattr(model, rel_key)
+
+        if attr:
+            json_dict[rel_key] = [serialize_model(i) for i in attr]
+
+    if plan.scalar_relationships:
+        for rel_key, local_key, related_id_field_name in plan.scalar_relationships:
             # Si no está en el set de propiedades no cargadas, la guardo en el diccionario con todos los atributos
             # que tenga
-            if rel.key not in ins.unloaded:
+            if rel_key not in unloaded:
                 # Vigilar posibles valores null
-                attr = getattr(model, rel.key)
+                attr = getattr(model, rel_key)
                 # Si es not null, llamo recursivamente a esta función
-                json_dict[rel.key] = serialize_model(attr) if attr is not None else None
-            else:
-                # Si no está cargada, al menos guardo un objeto de la clase que corresponda a la entidad lazyload con
-                # el id cargado
-                # Busco la foreing key asociada a la relación
-                for lcl in rel.local_columns:
-                    local_key = ins.mapper.get_property_by_column(lcl).key
-
-                    # Compruebo por si acaso que se encuentra en la lista de foreing keys de la entidad
-                    if local_key in foreign_key_names:
-                        attr = getattr(model, local_key)
-                        # Creo un diccionario con al menos el id de la entidad y lo añado al json_dict
-                        # OJO!!! NO debería llegar nada aquí con más de una clave primaria, find_entity_id_field_name
-                        # puede devolver una lista de strings pero no debería llegar hasta aquí ese caso porque ya estoy
-                        # controlando las entidades many to many.
-                        lazyload_dict = {find_entity_id_field_name(rel.mapper.class_): attr}
-                        json_dict[rel.key] = lazyload_dict if attr is not None else None
-                        break
+                json_dict[rel_key] = serialize_model(attr) if attr is not None else None
+            elif local_key is not None:
+                # Si no está cargada, al menos guardo un diccionario con el id de la entidad lazyload
+                attr = getattr(model, local_key)
+                json_dict[rel_key] = {related_id_field_name: attr} if attr is not None else None
 
     return json_dict
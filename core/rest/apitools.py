@@ -3,7 +3,11 @@ from dataclasses import dataclass
 
 from flask import make_response
 
-from core.utils.jsonutils import encode_object_to_json
+from core.utils.jsonutils import encode_object_to_json_bytes
+
+
+_JSON_HEADERS: dict = {"Content-Type": "application/json"}
+"""Cabeceras de las respuestas json."""
 
 
 class EnumHttpResponseStatusCodes(enum.Enum):
@@ -40,6 +44,8 @@ class EnumHttpResponseStatusCodes(enum.Enum):
 class RequestBody(object):
     """Objeto de cuerpo de Request."""
 
+    __slots__ = ("request_object",)
+
     def __init__(self, request_object: any = None):
         super().__init__()
         self.request_object = request_object
@@ -49,6 +55,8 @@ class RequestBody(object):
 class DBRequestBody(RequestBody):
     """Objeto de cuerpo de Request relacionadas con la base de datos."""
 
+    __slots__ = ("entity",)
+
     def __init__(self, entity: str, request_object: any = None):
         super().__init__(request_object=request_object)
         self.entity = entity
@@ -63,10 +71,21 @@ class RequestResponse:
     response_object: any
 
 
+def make_json_response(json_body: bytes, status_code: int):
+    """
+    Crea una respuesta json a partir de un cuerpo ya codificado. Útil para respuestas constantes que pueden
+    codificarse una sola vez.
+    :param json_body: Cuerpo de la respuesta codificado en json.
+    :param status_code: Código de estado de la respuesta.
+    :return: Respuesta válida para el solicitante en formato json.
+    """
+    return make_response(json_body, status_code, _JSON_HEADERS)
+
+
 def convert_request_response_to_json_response(response_body: RequestResponse):
     """
     Crea una respuesta json a partir de un RequestResponse.
     :param response_body: Objeto RequestResponse
     :return: Respuesta válida para el solicitante en formato json.
     """
-    return make_response(encode_object_to_json(response_body), response_body.status_code)
+    return make_json_response(encode_object_to_json_bytes(response_body), response_body.status_code)
@@ -5,6 +5,9 @@ from functools import wraps
 
 from core.service.servicetools import ServiceException
 
+_FUNCTION_TYPES: tuple = (types.FunctionType, types.MethodType)
+"""Tipos de atributo de clase a los que ErrorHandler añade la barrera de errores."""
+
 
 def catch_exceptions(function):
     """
@@ -57,11 +60,10 @@ class ErrorHandler(type):
         # Recorrer atributos de la clase, buscando aquéllos que sean funciones para asignarles un decorador
         # dinámicamente
         for attr_name, attr_value in attrs.items():
-            # si es una función, le añado el decorador
-            if isinstance(attr_value, types.FunctionType) or isinstance(attr_value, types.MethodType):  # noqa
-                # descarto las funciones heredadas de object, que empiezan y acaban en "__"
-                if callable(attr_value) and not attr_name.startswith("__"):
-                    # A la función le añado el decorador catch_exceptions
-                    attrs[attr_name] = catch_exceptions(attr_value)
+            # si es una función, le añado el decorador. Descarto las funciones heredadas de object, que empiezan y
+            # acaban en "__"
+            if isinstance(attr_value, _FUNCTION_TYPES) and not attr_name.startswith("__"):
+                # A la función le añado el decorador catch_exceptions
+                attrs[attr_name] = catch_exceptions(attr_value)
 
         return super(ErrorHandler, mcs).__new__(mcs, name, bases, attrs)
@@ -1,9 +1,9 @@
 import datetime
 import types
-from typing import Callable, Dict, Type, List, Union
+from typing import Callable, Dict, Type, List, Union, Sequence
 
 from core.dao.daotools import FilterClause, JoinClause, OrderByClause, FieldClause, EnumAggregateFunctions, \
-    GroupByClause, EnumFilterTypes
+    GroupByClause
 from core.dao.modelutils import BaseEntity, set_model_properties_by_dict, find_entity_id_field_name
 from core.service.errorhandler import ErrorHandler
 from core.service.servicetools import service_method
@@ -74,10 +74,10 @@ class BaseService(object, metaclass=ErrorHandler):
 
             # Devolver resultado
             return result
-        except Exception as e:
+        except Exception:
             # Si hay algún error, hacer rollback y devolver error hacia arriba.
             self._dao.rollback()
-            raise e
+            raise
         finally:
             # Desconectar siempre al final (sólo desconecta la función original, la que inició la transacción y solicitó
             # la conexión del hilo)
@@ -100,6 +100,17 @@ class BaseService(object, metaclass=ErrorHandler):
 
         self._dao.create(registry)
 
+    @service_method
+    def create_many(self, registries: List[BaseEntity]) -> None:
+        """
+        Crea varias entidades en la base de datos dentro de una única transacción y sincroniza sus ids. Cada registro
+        pasa por create, así que se aplican las mismas comprobaciones que en las creaciones individuales.
+        :param registries: Registros a crear.
+        :return: None
+        """
+        for registry in registries:
+            self.create(registry)
+
     @service_method
     def update(self, registry: BaseEntity) -> None:
         """
@@ -150,6 +161,25 @@ class BaseService(object, metaclass=ErrorHandler):
         """
         self._dao.delete(registry)
 
+    @service_method
+    def delete_by_id(self, registry_id: any) -> None:
+        """
+        Elimina un registro por id, sin necesidad de construir antes la entidad.
+        :param registry_id: Id del registro en la base de datos.
+        :return: None
+        """
+        self._dao.delete_by_id(registry_id)
+
+    @service_method
+    def delete_many_by_id(self, registry_ids: list) -> None:
+        """
+        Elimina varios registros por id con un único delete.
+        :param registry_ids: Ids de los registros a eliminar. Para entidades con múltiples primary-keys cada id es una
+        tupla con los valores de las pks.
+        :return: None
+        """
+        self._dao.delete_many_by_id(registry_ids)
+
     @service_method
     def load(self, registry_id: any) -> BaseEntity:
         """
@@ -161,7 +191,7 @@ class BaseService(object, metaclass=ErrorHandler):
         return self.find_by_id(registry_id)
 
     @service_method
-    def find_by_id(self, registry_id: any, join_clauses: List[JoinClause] = None):
+    def find_by_id(self, registry_id: any, join_clauses: Sequence[JoinClause] = None):
         """
         Devuelve un registro a partir de un id.
         :param registry_id: Id del registro en la base de datos.
@@ -171,7 +201,7 @@ class BaseService(object, metaclass=ErrorHandler):
         return self._dao.find_by_id(registry_id, join_clauses)
 
     @service_method
-    def select(self, filter_clauses: List[FilterClause] = None, join_clauses: List[JoinClause] = None,
+    def select(self, filter_clauses: List[FilterClause] = None, join_clauses: Sequence[JoinClause] = None,
                order_by_clauses: List[OrderByClause] = None, limit: int = None, offset: int = None):
         """
         Selecciona entidades cargadas con todos sus campos. Si se incluyem joins con fetch, traerá cargadas también
@@ -188,7 +218,7 @@ class BaseService(object, metaclass=ErrorHandler):
 
     @service_method
     def select_fields(self, field_clauses: List[FieldClause], filter_clauses: List[FilterClause] = None,
-                      join_clauses: List[JoinClause] = None, order_by_clauses: List[OrderByClause] = None,
+                      join_clauses: Sequence[JoinClause] = None, order_by_clauses: List[OrderByClause] = None,
                       group_by_clauses: List[GroupByClause] = None, limit: int = None, offset: int = None,
                       return_raw_result: bool = False) \
             -> Union[List[dict], List[BaseEntity]]:
@@ -213,7 +243,7 @@ class BaseService(object, metaclass=ErrorHandler):
 
     @service_method
     def count_by_filtered_query(self, filter_clauses: List[FilterClause] = None,
-                                join_clauses: List[JoinClause] = None) -> int:
+                                join_clauses: Sequence[JoinClause] = None) -> int:
         """
         Cuenta el número de registros de una tabla, pudiendo añadir filtros opcionales.
         :param filter_clauses: Filtros opcionales.
@@ -246,9 +276,6 @@ class BaseService(object, metaclass=ErrorHandler):
         para un update de tal manera que no se encuentre a sí misma y devuelva un falso positivo.
         :return: True si ya existe, False si no.
         """
-        filters: List[FilterClause] = [FilterClause(field_name=code_field_name, filter_type=EnumFilterTypes.EQUALS,
-                                                    object_to_compare=code_to_check)]
-
         # Para updates se debe pasar el id de la entidad para prevenir que se encuentre a sí misma durante la
         # comprobación.
         if entity_id is not None:
@@ -259,12 +286,9 @@ class BaseService(object, metaclass=ErrorHandler):
             if isinstance(id_field_name, list):
                 raise NotImplementedError("This method is not supported for entities with multiple primary keys.")
 
-            filters.append(FilterClause(field_name=id_field_name, filter_type=EnumFilterTypes.NOT_EQUALS,
-                                        object_to_compare=entity_id))
-
-        result: int = self.count_by_filtered_query(filter_clauses=filters)
-
-        return result > 0
+        # La consulta es siempre la misma para cada entidad y campo: un exists con el código (y el id a excluir) como
+        # parámetros, así que no hace falta contar todos los registros coincidentes.
+        return self._dao.does_field_value_exist(code_field_name, code_to_check, entity_id)
 
 
 class ServiceFactory(object):
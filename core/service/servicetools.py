@@ -35,6 +35,14 @@ class EnumServiceExceptionCodes(enum.Enum):
 class ServiceException(Exception):
     """Modelo para excepciones de servicio."""
 
+    _DEFAULT_TYPE_NAME: str = "ServiceException"
+    """Nombre del tipo de excepción por defecto. Se calcula una sola vez por clase en lugar de en cada instancia."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Cada subclase tiene su propio nombre de tipo por defecto
+        cls._DEFAULT_TYPE_NAME = cls.__name__
+
     def __init__(self, message: str,
                  error_code: Union[EnumServiceExceptionCodes, None] = EnumServiceExceptionCodes.SERVICE_ERROR,
                  i18n_key: Union[str, Tuple[str, Union[List[str], None]]] = None, trace: str = None,
@@ -54,7 +62,7 @@ class ServiceException(Exception):
         self.source_exception: Exception = source_exception
         """Excepción a partir de la que se ha originado la excepción personalizada. Por defecto ServiceException 
         si se pasa None como parámetro."""
-        self.exception_type: str = type(self).__name__ if exception_type is None else exception_type
+        self.exception_type: str = exception_type if exception_type is not None else self._DEFAULT_TYPE_NAME
         """Tipo de excepción."""
 
         # Si hay excepción origen y no se ha establecido un código de error, intentar calcularlo a partir de
@@ -1,9 +1,10 @@
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+from calendar import monthrange
+from datetime import datetime, date as date_type, time
+from functools import lru_cache
 from collections import namedtuple
 
 import enum
-from typing import Tuple
+from typing import Tuple, Dict
 
 _DateFormatType = namedtuple('DateFormatType', ['value', 'date_format'])
 """Tipos de formato de fecha."""
@@ -19,12 +20,35 @@ class EnumDateFormatTypes(enum.Enum):
     YEAR_MONTH_DAY_HH_MM_SS = _DateFormatType(1, "%Y-%m-%d %H:%M:%S")
 
 
+_DATE_FORMATS: Dict[EnumDateFormatTypes, str] = {f: f.value.date_format for f in EnumDateFormatTypes}
+"""Cadenas de formato de cada tipo de formato de fecha, para no pasar por la propiedad del enumerado en cada
+conversión."""
+
+_SQL_DATE_FORMAT: str = _DATE_FORMATS[EnumDateFormatTypes.YEAR_MONTH_DAY_HH_MM_SS]
+"""Formato de fecha SQL: YYYY-MM-dd HH:mm:ss"""
+
+_now = datetime.now
+"""Referencia directa a datetime.now para no resolver el atributo en cada llamada."""
+
+_strptime = datetime.strptime
+"""Referencia directa a datetime.strptime para no resolver el atributo en cada llamada."""
+
+_fromtimestamp = datetime.fromtimestamp
+"""Referencia directa a datetime.fromtimestamp para no resolver el atributo en cada llamada."""
+
+_START_OF_DAY: time = time(0, 0, 0)
+"""Hora de inicio del día."""
+
+_END_OF_DAY: time = time(23, 59, 59)
+"""Hora de fin del día."""
+
+
 def get_current_year() -> int:
     """
     Devuelve el año actual
     :return: Año actual. Número entero.
     """
-    return datetime.now().year
+    return _now().year
 
 
 def get_current_date() -> datetime:
@@ -32,7 +56,7 @@ def get_current_date() -> datetime:
     Devuelve la fecha actual.
     :return:
     """
-    return datetime.now()
+    return _now()
 
 
 def get_date_for_n_years_ago(years: int) -> datetime:
@@ -40,13 +64,13 @@ def get_date_for_n_years_ago(years: int) -> datetime:
     Devuelve la fecha de hace n años desde el día actual.
     :return:
     """
-    current_datetime = datetime.now()
+    current_datetime = _now()
+    year = current_datetime.year - years
 
-    try:
-        current_datetime = current_datetime.replace(year=current_datetime.year - years)
-    except ValueError:
-        current_datetime = current_datetime.replace(year=current_datetime.year - years, day=current_datetime.day - 1)
-    return current_datetime
+    # Ajusto el día al último del mes de destino (caso del 29 de febrero en años no bisiestos) sin pasar por una
+    # excepción.
+    day = min(current_datetime.day, monthrange(year, current_datetime.month)[1])
+    return current_datetime.replace(year=year, day=day)
 
 
 def get_date_six_months_ago() -> datetime:
@@ -54,10 +78,16 @@ def get_date_six_months_ago() -> datetime:
     Devuelve la fecha de hace seis meses desde el día actual.
     :return: Date
     """
-    current_date = datetime.today()
-    past_date = current_date - relativedelta(months=6)
+    current_date = _now()
 
-    return past_date
+    if current_date.month > 6:
+        year, month = current_date.year, current_date.month - 6
+    else:
+        year, month = current_date.year - 1, current_date.month + 6
+
+    # Si el mes de destino tiene menos días, me quedo con el último día del mes, igual que relativedelta
+    day = min(current_date.day, monthrange(year, month)[1])
+    return current_date.replace(year=year, month=month, day=day)
 
 
 def get_start_and_end_of_date(date) -> Tuple[datetime, datetime]:
@@ -66,8 +96,9 @@ def get_start_and_end_of_date(date) -> Tuple[datetime, datetime]:
     :param date:
     :return: Tupla.
     """
-    since_date = datetime(year=date.year, month=date.month, day=date.day, hour=0, minute=0, second=0)
-    till_date = datetime(year=date.year, month=date.month, day=date.day, hour=23, minute=59, second=59)
+    day = date.date() if isinstance(date, datetime) else date
+    since_date = datetime.combine(day, _START_OF_DAY)
+    till_date = datetime.combine(day, _END_OF_DAY)
 
     return since_date, till_date
 
@@ -78,8 +109,8 @@ def get_start_and_end_of_year(year: int) -> Tuple[datetime, datetime]:
     :param year: Año del que obtener el principio y final.
     :return: tupla.
     """
-    since_date = datetime(year=year, month=1, day=1, hour=0, minute=0, second=0)
-    till_date = datetime(year=year, month=12, day=31, hour=23, minute=59, second=59)
+    since_date = datetime.combine(date_type(year, 1, 1), _START_OF_DAY)
+    till_date = datetime.combine(date_type(year, 12, 31), _END_OF_DAY)
 
     return since_date, till_date
 
@@ -91,7 +122,7 @@ def format_date(datetime_to_format: datetime, date_format: EnumDateFormatTypes)
     :param date_format: Tipos de formato.
     :return: Fecha en formato str.
     """
-    return datetime_to_format.strftime(date_format.date_format)
+    return datetime_to_format.strftime(_DATE_FORMATS[date_format])
 
 
 def timestamp_to_date(timestamp: float) -> datetime:
@@ -100,7 +131,20 @@ def timestamp_to_date(timestamp: float) -> datetime:
     :param timestamp:
     :return:
     """
-    return datetime.fromtimestamp(timestamp)
+    return _fromtimestamp(timestamp)
+
+
+@lru_cache(maxsize=131072)
+def _parse_datetime(date_time_str: str, date_format: str) -> datetime:
+    """
+    Convierte un string a fecha usando strptime. Los datetime son inmutables, así que cacheo el resultado por string y
+    formato: las fechas que llegan repetidas (filtros, campos de fecha de los modelos) se resuelven sin volver a
+    parsear.
+    :param date_time_str: Fecha en formato string.
+    :param date_format: Cadena de formato para strptime.
+    :return: datetime
+    """
+    return _strptime(date_time_str, date_format)
 
 
 def string_to_datetime(date_time_str: str, date_format: EnumDateFormatTypes) -> datetime:
@@ -110,7 +154,7 @@ def string_to_datetime(date_time_str: str, date_format: EnumDateFormatTypes) ->
     :param date_format: Formato de fecha.
     :return: datetime
     """
-    return datetime.strptime(date_time_str, date_format.date_format)
+    return _parse_datetime(date_time_str, _DATE_FORMATS[date_format])
 
 
 def string_to_datetime_sql(date_time_str: str) -> datetime:
@@ -120,4 +164,4 @@ def string_to_datetime_sql(date_time_str: str) -> datetime:
     fecha SQL: YYYY-MM-dd HH:mm:ss
     :return: datetime
     """
-    return datetime.strptime(date_time_str, EnumDateFormatTypes.YEAR_MONTH_DAY_HH_MM_SS.date_format)
+    return _parse_datetime(date_time_str, _SQL_DATE_FORMAT)
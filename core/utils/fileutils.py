@@ -1,11 +1,15 @@
 import configparser
 import os.path
+from functools import lru_cache
+from typing import Dict, Iterable
 
 
+@lru_cache(maxsize=1)
 def get_project_root_dir() -> str:
     """
     Función para obtener el directorio raíz del proyecto. OJO!!! Sólo se ha testeado su correcto funcionamiento cuando
-    el nombre del fichero principal del proyecto es "main.py".
+    el nombre del fichero principal del proyecto es "main.py". El directorio no cambia durante la vida del proceso,
+    así que sólo se calcula la primera vez.
     :return: String con la ruta del directorio raíz.
     """
     # Busco el main del proyecto.
@@ -27,18 +31,14 @@ def get_project_root_dir() -> str:
     return root_dir
 
 
-def read_section_in_ini_file(file_name: str, section: str, file_path: str = None) -> dict:
+def _get_ini_file_full_path(file_name: str, file_path: str = None) -> str:
     """
-    Lee un fichero .ini y devuelve un diccionario con el contenido de la sección pasada como parámetro.
+    Devuelve la ruta completa de un fichero .ini, comprobando que existe.
     :param file_name: Nombre del fichero sin la ruta. Si no incluye la extensión, se le añade dentro de esta función.
-    :param section: Nombre de la sección a leer.
     :param file_path: Ruta del fichero sin incluir su nombre. Si no se especifica, se considerará que la ruta es el
     directorio "resources" de la raíz del proyecto.
-    :return: dict
+    :return: str
     """
-    # Preparo el parseador de ficheros
-    config = configparser.ConfigParser()
-
     # Si no se ha especificado una ruta para el fichero, asumo que es la raíz del proyecto
     if file_path is None:
         file_path = os.path.join(get_project_root_dir(), 'resources')
@@ -58,16 +58,44 @@ def read_section_in_ini_file(file_name: str, section: str, file_path: str = None
     if not os.path.exists(full_path):
         raise Exception(f'File \"{full_path}\" does not exist.')
 
+    return full_path
+
+
+def read_all_sections_in_ini_file(file_name: str, file_path: str = None,
+                                  required_sections: Iterable[str] = ()) -> Dict[str, dict]:
+    """
+    Lee un fichero .ini y devuelve un diccionario con el contenido de todas sus secciones. Útil cuando se necesitan
+    varias secciones del mismo fichero, para leerlo una sola vez.
+    :param file_name: Nombre del fichero sin la ruta. Si no incluye la extensión, se le añade dentro de esta función.
+    :param file_path: Ruta del fichero sin incluir su nombre. Si no se especifica, se considerará que la ruta es el
+    directorio "resources" de la raíz del proyecto.
+    :param required_sections: Secciones que deben existir en el fichero. Si falta alguna, se lanza una excepción.
+    :return: Dict[str, dict]
+    """
+    full_path: str = _get_ini_file_full_path(file_name, file_path)
+
+    # Preparo el parseador de ficheros
+    config = configparser.ConfigParser()
+
     # Lectura del fichero
     config.read(full_path)
 
-    # Comprobar que la sección existe en el fichero.
-    if section not in config.sections():
-        raise Exception(f'Section \"{section}\" does not exist in .ini file {file_name}')
+    # Comprobar que las secciones requeridas existen en el fichero.
+    for section in required_sections:
+        if section not in config.sections():
+            raise Exception(f'Section \"{section}\" does not exist in .ini file {os.path.basename(full_path)}')
 
-    # Creo un diccionario para devolver el contenido de la sección pasada como parámetro.
-    section_dict: dict = {}
-    for key, value in config[section].items():
-        section_dict[key] = value
+    # Creo un diccionario por sección con su contenido.
+    return {section: dict(config[section]) for section in config.sections()}
 
-    return section_dict
+
+def read_section_in_ini_file(file_name: str, section: str, file_path: str = None) -> dict:
+    """
+    Lee un fichero .ini y devuelve un diccionario con el contenido de la sección pasada como parámetro.
+    :param file_name: Nombre del fichero sin la ruta. Si no incluye la extensión, se le añade dentro de esta función.
+    :param section: Nombre de la sección a leer.
+    :param file_path: Ruta del fichero sin incluir su nombre. Si no se especifica, se considerará que la ruta es el
+    directorio "resources" de la raíz del proyecto.
+    :return: dict
+    """
+    return read_all_sections_in_ini_file(file_name, file_path, required_sections=(section,))[section]
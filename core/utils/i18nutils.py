@@ -1,9 +1,28 @@
 import gettext
 import locale
+import os.path
+from functools import lru_cache
 from typing import List, Dict
 
 from core.utils.fileutils import get_project_root_dir
 
+_default_locale_iso: str = locale.getlocale()[0]
+"""Iso del locale del sistema. Se calcula una vez al cargar el módulo para no consultarlo en cada traducción; se
+recalcula con refresh_default_locale."""
+
+
+@lru_cache(maxsize=128)
+def _load_translation(mo_file_name: str, file_path: str, iso_key: str) -> any:
+    """
+    Carga el catálogo de traducciones de un idioma. Se cachea para que cada fichero .mo sólo se busque y se lea una
+    vez por idioma.
+    :param mo_file_name: Nombre del fichero mo sin la extensión.
+    :param file_path: Ruta del directorio "locales".
+    :param iso_key: Iso del idioma.
+    :return: Objeto de traducción de gettext.
+    """
+    return gettext.translation(mo_file_name, file_path, languages=[iso_key], fallback=True)
+
 
 def prepare_translations(language_list: List[str], mo_file_name: str, dir_name: str) -> Dict[str, any]:
     """
@@ -15,13 +34,9 @@ def prepare_translations(language_list: List[str], mo_file_name: str, dir_name:
     en el nombre del directorio NO hay que incluir esa palabra.
     :return: Dict[str, any]
     """
-    translations: Dict[str, any] = {}
-
-    file_path: str = f'{get_project_root_dir()}/{dir_name}/locales'
-    for iso_key in language_list:
-        translations[iso_key] = gettext.translation(mo_file_name, file_path, languages=[iso_key], fallback=True)
+    file_path: str = os.path.join(get_project_root_dir(), dir_name, 'locales')
 
-    return translations
+    return {iso_key: _load_translation(mo_file_name, file_path, iso_key) for iso_key in language_list}
 
 
 def change_locale(locale_iso: str):
@@ -29,6 +44,26 @@ def change_locale(locale_iso: str):
     :param locale_iso: Código Iso del locale al que se quiere cambiar
     """
     locale.setlocale(locale.LC_ALL, locale_iso)
+    refresh_default_locale()
+    _gettext.cache_clear()
+
+
+def refresh_default_locale() -> None:
+    """Vuelve a leer el locale del sistema para usarlo como idioma por defecto en las traducciones."""
+    global _default_locale_iso
+    _default_locale_iso = locale.getlocale()[0]
+
+
+@lru_cache(maxsize=4096)
+def _gettext(translation: any, key: str) -> str:
+    """
+    Devuelve el valor de una clave i18n para un objeto de traducción. Se cachea por objeto de traducción y clave
+    porque las mismas claves (mensajes de error, etiquetas) se traducen una y otra vez.
+    :param translation: Objeto de traducción de gettext.
+    :param key: Clave i18n.
+    :return: str
+    """
+    return translation.gettext(key)
 
 
 def translate(key: str, languages: Dict[str, any], locale_iso: str = None, args: list = None) -> str:
@@ -42,7 +77,7 @@ def translate(key: str, languages: Dict[str, any], locale_iso: str = None, args:
     """
     # Primero obtengo el valor de la clave en los ficheros po/mo
     # Locale es una tupla, el primer valor es el código del idioma que es lo que uso en como clave del diccionario
-    result = languages[locale_iso if locale_iso is not None else locale.getlocale()[0]].gettext(key)
+    result = _gettext(languages[locale_iso if locale_iso is not None else _default_locale_iso], key)
 
     # Ahora, si han llegado parámetros para sustituir los placeholders, los sustituyo en el valor obtenido
     if args:
@@ -1,34 +1,74 @@
-import inspect
+import datetime
+import enum
 import json
+from functools import lru_cache
 from json import JSONEncoder
+from typing import List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+"""orjson es opcional: si está instalado se usa para codificar, si no se usa el módulo json estándar. Ambos caminos
+devuelven el mismo json."""
+
+_ORJSON_OPTIONS: int = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | \
+    orjson.OPT_PASSTHROUGH_DATACLASS if orjson is not None else 0
+"""Opciones de orjson equivalentes a las utilizadas con json.dumps: indentación de 2, claves ordenadas y claves no
+string. Los dataclasses se delegan a _json_default para que se codifiquen igual que con json.dumps."""
+
+
+@lru_cache(maxsize=None)
+def _get_public_slots(cls: type) -> Tuple[str, ...]:
+    """
+    Devuelve los nombres de los slots públicos de una clase, incluyendo los de sus clases padre.
+    :param cls: Clase.
+    :return: Tupla con los nombres de los slots.
+    """
+    slots: List[str] = []
+    for c in reversed(cls.__mro__):
+        c_slots = c.__dict__.get("__slots__", ())
+        for slot in ((c_slots,) if isinstance(c_slots, str) else c_slots):
+            if not slot.startswith("_") and slot not in slots:
+                slots.append(slot)
+
+    return tuple(slots)
+
+
+def _json_default(obj):
+    """
+    Convierte a un tipo serializable aquellos objetos que el codificador json no sabe tratar.
+    :param obj: Objeto a convertir.
+    :return: Objeto serializable.
+    """
+    # Si tiene una función to_json, se usa dicha función para la codificación. Si lo que devuelve tampoco es
+    # serializable, el propio codificador volverá a llamar a esta función.
+    if hasattr(obj, "to_json"):
+        return obj.to_json()
+    elif isinstance(obj, (datetime.date, datetime.time)):
+        # Fechas y horas en formato ISO 8601, igual que las codifica orjson (datetime es subclase de date)
+        return obj.isoformat()
+    elif isinstance(obj, enum.Enum):
+        # Los enumerados se codifican por su valor. Va antes que __dict__ porque todos los atributos de instancia de
+        # un miembro de Enum son privados y se perdería el dato.
+        return obj.value
+    elif hasattr(obj, "__dict__"):
+        # En cualquier otro caso se usa el atributo builtin __dict__ que tienen todas las clases. Sólo recorro los
+        # atributos de instancia, descartando los privados y los invocables; el diccionario resultante lo codifica
+        # directamente el propio codificador.
+        return {key: value for key, value in vars(obj).items() if not key.startswith("_") and not callable(value)}
+    elif hasattr(obj, "__slots__"):
+        # Clases con __slots__ y sin __dict__: recorro directamente los slots públicos que tengan valor.
+        return {key: getattr(obj, key) for key in _get_public_slots(type(obj)) if hasattr(obj, key)}
+
+    return obj
 
 
 class CustomJsonEncoder(JSONEncoder):
     """Codificador JSON de entidades."""
 
     def default(self, obj):
-        # Si tiene una función to_json, se usa dicha función para la codificación.
-        if hasattr(obj, "to_json"):
-            return self.default(obj.to_json())
-        elif hasattr(obj, "__dict__"):
-            # En cualquier otro caso se usa el atributo builtin __dict__ que tienen todas las clases.
-            d = dict(
-                (key, value)
-                # Aquí se descartan ciertos atributos, como los privados, abstractos, builtin...
-                for key, value in inspect.getmembers(obj)
-                if not key.startswith("__")
-                and not inspect.isabstract(value)
-                and not inspect.isbuiltin(value)
-                and not inspect.isfunction(value)
-                and not inspect.isgenerator(value)
-                and not inspect.isgeneratorfunction(value)
-                and not inspect.ismethod(value)
-                and not inspect.ismethoddescriptor(value)
-                and not inspect.isroutine(value)
-            )
-            return self.default(d)
-
-        return obj
+        return _json_default(obj)
 
 
 def encode_object_to_json(object_to_encode: any) -> str:
@@ -37,10 +77,38 @@ def encode_object_to_json(object_to_encode: any) -> str:
     :param object_to_encode:
     :return: str
     """
+    if orjson is not None:
+        return orjson.dumps(object_to_encode, default=_json_default, option=_ORJSON_OPTIONS).decode("utf-8")
+
     return json.dumps(object_to_encode, cls=CustomJsonEncoder, indent=2, sort_keys=True,
                       ensure_ascii=False)
 
 
+def encode_object_to_json_bytes(object_to_encode: any) -> bytes:
+    """
+    Codifica un objeto a json en utf-8. Con orjson se evita pasar la salida a string para volver a codificarla
+    después, por ejemplo al escribirla en el cuerpo de una respuesta http.
+    :param object_to_encode:
+    :return: bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(object_to_encode, default=_json_default, option=_ORJSON_OPTIONS)
+
+    return encode_object_to_json(object_to_encode).encode("utf-8")
+
+
+def decode_json(json_format: Union[str, bytes]) -> any:
+    """
+    Decodifica un documento json a objetos de python (diccionarios, listas...). Usa orjson si está instalado.
+    :param json_format: Documento json, como string o como bytes en utf-8.
+    :return: Objeto decodificado.
+    """
+    if orjson is not None:
+        return orjson.loads(json_format)
+
+    return json.loads(json_format)
+
+
 def decode_object_from_json(json_format: str, t: type) -> any:
     """
     Transforma un string formato json a una instancia de un objeto.
@@ -49,7 +117,7 @@ def decode_object_from_json(json_format: str, t: type) -> any:
     :return: Instancia de t con los atributos especificados en json_format.
     """
     # lo convierto a diccionario
-    json_dict = json.loads(json_format)
+    json_dict = decode_json(json_format)
     # Instanciar un nuevo tipo t.
     # El operador ** en este caso va a coger el diccionario y va a descomponerlo en grupos de clave valor, de tal
     # manera que la clave será el identificador del parámetro de __init__ y el valor su valor. Es decir, esto llama
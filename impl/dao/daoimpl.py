@@ -1,7 +1,7 @@
-from typing import List
+from typing import List, Tuple, Union
 
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import aliased, contains_eager
+from sqlalchemy import select, and_, or_, bindparam
+from sqlalchemy.orm import aliased, contains_eager, load_only
 
 from core.dao.basedao import BaseDao
 from core.dao.daotools import FilterClause, EnumFilterTypes, JoinClause, EnumJoinTypes
@@ -12,6 +12,63 @@ from impl.model.usuario import Usuario
 from impl.model.usuariorol import UsuarioRol
 
 
+_USUARIO_FIELDS: Tuple[str, ...] = ("id", "username")
+"""Campos de los usuarios de auditoría que se cargan en ClienteDaoImpl.test_join. El resto (entre ellos el hash de la
+contraseña) no se necesita."""
+
+
+def _build_test_join_statement():
+    """
+    Construye la consulta de ClienteDaoImpl.test_join. Los alias y los joins no cambian entre llamadas, así que se
+    construye una sola vez con los valores de los filtros como bindparams.
+    :return: Statement de SQLAlchemy.
+    """
+    alias_0 = aliased(TipoCliente, name="tipo_cliente")
+    alias_1 = aliased(Usuario, name="usuario_creacion")
+    alias_2 = aliased(Usuario, name="usuario_ult_mod")
+
+    alias_3 = aliased(Usuario, name="tipo_cliente_usuario_ult_mod")
+    alias_4 = aliased(Usuario, name="tipo_cliente_usuario_creacion")
+
+    return select(Cliente). \
+        outerjoin(Cliente.usuario_ult_mod.of_type(alias_2)). \
+        outerjoin(Cliente.usuario_creacion.of_type(alias_1)). \
+        join(Cliente.tipo_cliente.of_type(alias_0)). \
+        outerjoin(TipoCliente.usuario_creacion.of_type(alias_4)). \
+        outerjoin(TipoCliente.usuario_ult_mod.of_type(alias_3)). \
+        options(
+        contains_eager(Cliente.tipo_cliente, TipoCliente.usuario_ult_mod.of_type(alias_3)).load_only(*_USUARIO_FIELDS),
+        contains_eager(Cliente.tipo_cliente, TipoCliente.usuario_creacion.of_type(alias_4)).load_only(*_USUARIO_FIELDS),
+        contains_eager(Cliente.tipo_cliente.of_type(alias_0)),
+        contains_eager(Cliente.usuario_creacion.of_type(alias_1)).load_only(*_USUARIO_FIELDS),
+        contains_eager(Cliente.usuario_ult_mod.of_type(alias_2)).load_only(*_USUARIO_FIELDS),
+    ).where(or_(and_(alias_0.codigo.like(bindparam("tipo_cliente_codigo")),
+                     alias_0.descripcion.like(bindparam("tipo_cliente_descripcion"))),
+                or_(alias_4.username.like(bindparam("tipo_cliente_usuario_creacion_username_1")),
+                    alias_4.username.like(bindparam("tipo_cliente_usuario_creacion_username_2"))).self_group()))
+
+
+_TEST_JOIN_STMT = _build_test_join_statement()
+"""Consulta de ClienteDaoImpl.test_join."""
+
+_SELECT_USUARIOS_ROLES_KEYS_BY_ROL_STMT = select(UsuarioRol.rolid, UsuarioRol.usuarioid). \
+    where(UsuarioRol.rolid == bindparam("rolid"))
+"""Consulta de las claves de los usuarios_roles de un rol, para UsuarioRolDaoImpl.update_usuarios_roles_by_rol."""
+
+_SELECT_USUARIO_BY_USERNAME_STMT = select(Usuario).where(Usuario.username == bindparam("username")).limit(1)
+"""Consulta de un usuario por nombre de usuario, para UsuarioDaoImpl.find_by_username."""
+
+_SELECT_USUARIO_PASSWORD_BY_ID_STMT = select(Usuario.password).where(Usuario.id == bindparam("id"))
+"""Consulta del password de un usuario, para UsuarioDaoImpl.find_password_by_id."""
+
+_FIND_BY_ROL_ID_JOINS: Tuple[JoinClause, ...] = (
+    JoinClause("rol", EnumJoinTypes.INNER_JOIN, True),
+    JoinClause("usuario", EnumJoinTypes.INNER_JOIN, True)
+)
+"""Joins de UsuarioRolDaoImpl.find_by_rol_id. No cambian entre llamadas y el select no los modifica, así que se crean
+una sola vez."""
+
+
 class TipoClienteDaoImpl(BaseDao):
     """Implementación del DAO de tipos de cliente."""
 
@@ -25,6 +82,31 @@ class UsuarioDaoImpl(BaseDao):
     def __init__(self):
         super().__init__(table=Usuario.__tablename__, entity_type=Usuario)
 
+    def find_by_username(self, username: str) -> Union[Usuario, None]:
+        """
+        Devuelve un usuario buscándolo por nombre de usuario. La consulta es siempre la misma, así que se ejecuta
+        directamente el statement ya construido en lugar de montarlo a partir de FilterClauses.
+        :param username: Nombre de usuario.
+        :return: Usuario, o None si no existe.
+        """
+        my_session = type(self).get_session_for_current_thread()
+        usuario: Union[Usuario, None] = my_session.execute(_SELECT_USUARIO_BY_USERNAME_STMT,
+                                                           {"username": username}).scalars().first()
+
+        # Igual que en las selects del dao base, libero los elementos de la sesión
+        my_session.expunge_all()
+
+        return usuario
+
+    def find_password_by_id(self, usuario_id: int) -> Union[str, None]:
+        """
+        Devuelve el password encriptado de un usuario sin cargar la entidad.
+        :param usuario_id: Id del usuario.
+        :return: Password encriptado, o None si el usuario no existe.
+        """
+        my_session = type(self).get_session_for_current_thread()
+        return my_session.execute(_SELECT_USUARIO_PASSWORD_BY_ID_STMT, {"id": usuario_id}).scalar()
+
 
 class RolDaoImpl(BaseDao):
     """Implementación del DAO de usuarios."""
@@ -40,16 +122,11 @@ class UsuarioRolDaoImpl(BaseDao):
         super().__init__(table=UsuarioRol.__tablename__, entity_type=UsuarioRol)
 
     def find_by_rol_id(self, rol_id: int):
-        join_clauses: List[JoinClause] = [
-            JoinClause("rol", EnumJoinTypes.INNER_JOIN, True),
-            JoinClause("usuario", EnumJoinTypes.INNER_JOIN, True)
-        ]
-
         filters: List[FilterClause] = [
             FilterClause(field_name="rol.id", filter_type=EnumFilterTypes.EQUALS, object_to_compare=rol_id)
         ]
 
-        return self.select(filter_clauses=filters, join_clauses=join_clauses)
+        return self.select(filter_clauses=filters, join_clauses=_FIND_BY_ROL_ID_JOINS)
 
     def update_usuarios_roles_by_rol(self, rol: Rol, usuarios_asociados: List[UsuarioRol]):
         """
@@ -58,8 +135,16 @@ class UsuarioRolDaoImpl(BaseDao):
         :param usuarios_asociados:
         :return:
         """
-        usuarios_roles_old: List[UsuarioRol] = self.find_by_rol_id(rol.id)
-        self._update_many_to_many(many_to_many_old=usuarios_roles_old, many_to_many_new=usuarios_asociados)
+        my_session = type(self).get_session_for_current_thread()
+
+        # Para comparar sólo necesito las claves de los registros existentes: las consulto como tuplas en lugar de
+        # cargar las entidades con sus joins.
+        keys_old: set = {tuple(row) for row in my_session.execute(_SELECT_USUARIOS_ROLES_KEYS_BY_ROL_STMT,
+                                                                  {"rolid": rol.id})}
+        new_by_key: dict = {(u.rolid, u.usuarioid): u for u in usuarios_asociados}
+
+        self.delete_many_by_id([key for key in keys_old if key not in new_by_key])
+        self.create_many([u for key, u in new_by_key.items() if key not in keys_old])
 
 
 class ClienteDaoImpl(BaseDao):
@@ -68,7 +153,11 @@ class ClienteDaoImpl(BaseDao):
     def __init__(self):
         super().__init__(table=Cliente.__tablename__, entity_type=Cliente)
 
-    def test_join(self):
+    def test_join(self) -> List[Cliente]:
+        """
+        Consulta de prueba de clientes con joins anidados sobre tipo de cliente y usuarios.
+        :return: Lista de clientes con sus relaciones cargadas.
+        """
         my_session = type(self).get_session_for_current_thread()
 
         # select cliente, cliente.tipocliente, cliente.tipocliente.usuario_creacion, cliente.tipocliente.usuario_ultmod,
@@ -79,43 +168,11 @@ class ClienteDaoImpl(BaseDao):
         # where cliente.tipo_cliente.codigo like '%0%' and cliente.tipo_cliente.descripcion like '%a%' or
         # (cliente.tipo_cliente.usuario_creacion.username like '%a%' or
         # cliente.tipo_cliente.usuario_creacion.username like '%e%')
-
-        # where(or_(and_(alias_0.codigo.like("%0%"), alias_0.descripcion.like("%a%")),
-        #          or_(alias_4.username.like("%a%"), alias_4.username.like("%e%")).self_group()))
-
-        alias_0 = aliased(TipoCliente, name="tipo_cliente")
-        alias_1 = aliased(Usuario, name="usuario_creacion")
-        alias_2 = aliased(Usuario, name="usuario_ult_mod")
-
-        alias_3 = aliased(Usuario, name="tipo_cliente_usuario_ult_mod")
-        alias_4 = aliased(Usuario, name="tipo_cliente_usuario_creacion")
-
-        stmt = select(Cliente).\
-            outerjoin(Cliente.usuario_ult_mod.of_type(alias_2)). \
-            outerjoin(Cliente.usuario_creacion.of_type(alias_1)). \
-            join(Cliente.tipo_cliente.of_type(alias_0)). \
-            outerjoin(TipoCliente.usuario_creacion.of_type(alias_4)). \
-            outerjoin(TipoCliente.usuario_ult_mod.of_type(alias_3)). \
-            options(
-            contains_eager(Cliente.tipo_cliente, TipoCliente.usuario_ult_mod.of_type(alias_3)),
-            contains_eager(Cliente.tipo_cliente, TipoCliente.usuario_creacion.of_type(alias_4)),
-            contains_eager(Cliente.tipo_cliente.of_type(alias_0)),
-            contains_eager(Cliente.usuario_creacion.of_type(alias_1)),
-            contains_eager(Cliente.usuario_ult_mod.of_type(alias_2)),
-        ).where(or_(and_(alias_0.codigo.like("%0%"), alias_0.descripcion.like("%a%")),
-                    or_(alias_4.username.like("%a%"), alias_4.username.like("%e%")).self_group()))
-
-        # Ejecutar la consulta
-        result = my_session.execute(stmt).scalars().all()
-
-        # Para evitar problemas, hago flush y libero todos los elementos
-        my_session.flush()
-        my_session.expunge_all()
-
-        for r in result:
-            print(f"\nTipo cliente: {r.tipo_cliente} \n "
-                  f"Usuario creación: {r.usuario_creacion}\n "
-                  f"Usuario última mod.: {r.usuario_ult_mod}\n"
-                  f"TipoCliente - UsuarioCreacion: {r.tipo_cliente.usuario_creacion}\n"
-                  f"TipoCliente - usuario_ult_mod: {r.tipo_cliente.usuario_ult_mod}\n"
-                  )
+        stmt = _TEST_JOIN_STMT
+        params: dict = {"tipo_cliente_codigo": "%0%", "tipo_cliente_descripcion": "%a%",
+                        "tipo_cliente_usuario_creacion_username_1": "%a%",
+                        "tipo_cliente_usuario_creacion_username_2": "%e%"}
+
+        # Ejecutar la consulta. Es de sólo lectura, así que no hago flush ni libero los elementos aquí: el commit de la
+        # transacción ya los libera de la sesión al terminar.
+        return my_session.execute(stmt, params).scalars().all()
@@ -33,13 +33,18 @@ class Cliente(BaseEntity):
 
     # MÉTODOS
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.id == other.id
-        else:
+        if other is self:
+            return True
+        if type(other) is not type(self):
             return False
+        return self.id == other.id
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __repr__(self):
-        return f'[Cliente] id = {self.id}, codigo = {self.codigo}, nombre = {self.nombre}, apellidos = {self.apellidos}'
+        # Leo directamente del __dict__ de la instancia para no pasar por los descriptores instrumentados de
+        # SQLAlchemy: así el repr nunca dispara una carga ni falla con entidades separadas de la sesión.
+        values = self.__dict__
+        return f'[Cliente] id = {values.get("id")}, codigo = {values.get("codigo")}, ' \
+               f'nombre = {values.get("nombre")}, apellidos = {values.get("apellidos")}'
@@ -23,10 +23,11 @@ class Usuario(BaseEntity):
         super(Usuario, self).__init__(**kwargs)
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.id == other.id
-        else:
+        if other is self:
+            return True
+        if type(other) is not type(self):
             return False
+        return self.id == other.id
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -19,13 +19,30 @@ class UsuarioRol(BaseEntity):
         super(UsuarioRol, self).__init__(**kwargs)
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.rolid == other.rolid and self.usuarioid == other.usuarioid
-        else:
+        if other is self:
+            return True
+        if type(other) is not type(self) or not self._has_pk() or not other._has_pk():
+            # Mientras la clave no esté completa, cada registro sólo es igual a sí mismo (igual que su hash)
             return False
+        return self.rolid == other.rolid and self.usuarioid == other.usuarioid
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        # Al redefinir __eq__ Python deja la clase sin hash; lo calculo con la misma clave que la igualdad para poder
+        # usar los registros en sets y como claves de diccionarios. Mientras la clave no esté completa se usa la
+        # identidad del objeto. OJO!!! Un registro no debe cambiar de clave mientras esté en un set o diccionario.
+        if not self._has_pk():
+            return id(self)
+        return hash((self.rolid, self.usuarioid))
+
+    def _has_pk(self) -> bool:
+        """
+        Indica si el registro tiene informada su clave primaria completa.
+        :return: bool
+        """
+        return self.rolid is not None and self.usuarioid is not None
+
     def __repr__(self):
         return f'[UsuarioRol] rolid = {self.rolid}, usuarioid = {self.usuarioid}'
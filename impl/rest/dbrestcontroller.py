@@ -6,8 +6,9 @@ from flask_jwt_extended import get_jwt_identity
 from core.dao.daotools import JsonQuery
 from core.dao.modelutils import serialize_model, deserialize_model, find_entity_id_field_name
 from core.rest.apitools import RequestResponse, EnumHttpResponseStatusCodes, DBRequestBody, \
-    convert_request_response_to_json_response
+    convert_request_response_to_json_response, make_json_response
 from core.service.service import BaseService
+from core.utils.jsonutils import encode_object_to_json_bytes
 from impl.model.usuario import Usuario
 from impl.rest import servicehandler
 from impl.rest.restutils import db_rest_fn, does_entity_have_create_update_user
@@ -15,47 +16,64 @@ from impl.rest.restutils import db_rest_fn, does_entity_have_create_update_user
 db_service_blueprint = Blueprint("DBService", __name__, url_prefix='/api/DBService')
 """Blueprint para módulo de api."""
 
+_OK_STATUS_CODE: int = EnumHttpResponseStatusCodes.OK.value
+"""Código de estado de las respuestas correctas."""
 
-@db_service_blueprint.route('/create', methods=['POST'])
-def create():
+_EMPTY_SELECT_RESPONSE_BODY: bytes = encode_object_to_json_bytes(
+    RequestResponse(response_object=[], success=True, status_code=_OK_STATUS_CODE))
+"""Cuerpo json de las selects sin resultados. Es siempre el mismo, así que se codifica una sola vez."""
+
+
+@db_rest_fn
+def _create(request_body: DBRequestBody, service: BaseService):
     """
-    Servicio Rest para crear entidades en la base de datos.
+    Función interna create.
+    :param request_body:
+    :param service:
+    :return: Response.
     """
+    # Obtener identidad del usuario
+    current_user_id = get_jwt_identity()
+
+    # Objeto query_object creado a partir del request_object
+    entity_to_be_created = deserialize_model(request_body.request_object, service.get_entity_type(), True)
 
-    @db_rest_fn
-    def __create(*args, **kwargs): # noqa
-        """
-        Función interna create.
-        :param request_body:
-        :param service:
-        :return: Response.
-        """
-        request_body: DBRequestBody = kwargs["request_body"]
-        service: BaseService = kwargs["service"]
+    # Usuario de creación/modificación
+    has_create_update_user: tuple = does_entity_have_create_update_user(service.get_entity_type())
+    user: Usuario = servicehandler.UsuarioRestService.find_by_id(current_user_id)
+    if has_create_update_user[0]:
+        setattr(entity_to_be_created, "usuario_creacion", user)
+    if has_create_update_user[1]:
+        setattr(entity_to_be_created, "usuario_ult_mod", user)
 
-        # Obtener identidad del usuario
-        current_user_id = get_jwt_identity()
+    service.create(entity_to_be_created)
 
-        # Objeto query_object creado a partir del request_object
-        entity_to_be_created = deserialize_model(request_body.request_object, service.get_entity_type(), True)
+    json_result = f"'{entity_to_be_created}' has been created."
+    response_body = RequestResponse(response_object=json_result, success=True,
+                                    status_code=_OK_STATUS_CODE)
 
-        # Usuario de creación/modificación
-        has_create_update_user: tuple = does_entity_have_create_update_user(service.get_entity_type())
-        user: Usuario = servicehandler.UsuarioRestService.find_by_id(current_user_id)
-        if has_create_update_user[0]:
-            setattr(entity_to_be_created, "usuario_creacion", user)
-        if has_create_update_user[1]:
-            setattr(entity_to_be_created, "usuario_ult_mod", user)
+    return convert_request_response_to_json_response(response_body)
 
-        service.create(entity_to_be_created)
 
-        json_result = f"'{entity_to_be_created}' has been created."
-        response_body = RequestResponse(response_object=json_result, success=True,
-                                        status_code=EnumHttpResponseStatusCodes.OK.value)
+@db_service_blueprint.route('/create', methods=['POST'])
+def create():
+    """
+    Servicio Rest para crear entidades en la base de datos.
+    """
+    return _create()
+
 
-        return convert_request_response_to_json_response(response_body)
+@db_rest_fn
+def _load(request_body: DBRequestBody, service: BaseService):
+    # Objeto query_object creado a partir del request_object
+    entity_id = request_body.request_object["entity_id"]
+    entity = service.load(entity_id)
+    json_result = serialize_model(entity)
 
-    return __create()
+    response_body = RequestResponse(response_object=json_result, success=True,
+                                    status_code=_OK_STATUS_CODE)
+
+    return convert_request_response_to_json_response(response_body)
 
 
 @db_service_blueprint.route('/load', methods=['POST'])
@@ -63,77 +81,86 @@ def load():
     """
     Servicio Rest para carga completa de entidades.
     """
+    return _load()
 
-    @db_rest_fn
-    def __load(*args, **kwargs):  # noqa
-        request_body: DBRequestBody = kwargs["request_body"]
-        service: BaseService = kwargs["service"]
 
-        # Objeto query_object creado a partir del request_object
-        entity_id = request_body.request_object["entity_id"]
-        entity = service.load(entity_id)
-        json_result = serialize_model(entity)
+@db_rest_fn
+def _update(request_body: DBRequestBody, service: BaseService):
+    """
+    Función interna update.
+    :param request_body:
+    :param service:
+    :return: Response.
+    """
+    # Obtener identidad del usuario
+    current_user_id = get_jwt_identity()
 
-        response_body = RequestResponse(response_object=json_result, success=True,
-                                        status_code=EnumHttpResponseStatusCodes.OK.value)
+    # Comprobar si la entidad tiene usuarios de creación/modificación.
+    has_create_update_user: tuple = does_entity_have_create_update_user(service.get_entity_type())
 
-        return convert_request_response_to_json_response(response_body)
+    # Recupero el id de la entidad del diccionario de valores.
+    id_field_name: Union[str, list] = find_entity_id_field_name(service.get_entity_type())
+    entity_id: any
 
-    return __load()
+    # Si el id field es un listado significa que es una tabla con más de una clave primaria y no debería pasar
+    # utilizar un rest service para modificar sus datos, deberían venir siempre como dato adicional de una
+    # tabla principal
+    if isinstance(id_field_name, list):
+        raise ValueError(f"Entity type {service.get_entity_type().__name__} not allowed for direct update.")
 
+    if id_field_name in request_body.request_object:
+        entity_id = request_body.request_object[id_field_name]
+    else:
+        raise KeyError("You have to specify the id of the entity on the request.")
 
-@db_service_blueprint.route('/update', methods=['POST'])
-def update():
-    """
-    Servicio Rest para actualizar entidades en la base de datos.
-    """
-
-    @db_rest_fn
-    def __update(*args, **kwargs): # noqa
-        """
-        Función interna update.
-        :param request_body:
-        :param service:
-        :return: Response.
-        """
-        request_body: DBRequestBody = kwargs["request_body"]
-        service: BaseService = kwargs["service"]
+    # Usuario de última modificación
+    if has_create_update_user[1]:
+        request_body.request_object["usuario_ult_mod"] = {"id": current_user_id}
 
-        # Obtener identidad del usuario
-        current_user_id = get_jwt_identity()
+    # Actualizo los campos pasados como parámetro.
+    entity_to_be_updated = service.update_fields(registry_id=entity_id, values_dict=request_body.request_object)
 
-        # Comprobar si la entidad tiene usuarios de creación/modificación.
-        has_create_update_user: tuple = does_entity_have_create_update_user(service.get_entity_type())
+    json_result = f"'{entity_to_be_updated}' has been updated."
+    response_body = RequestResponse(response_object=json_result, success=True,
+                                    status_code=_OK_STATUS_CODE)
 
-        # Recupero el id de la entidad del diccionario de valores.
-        id_field_name: Union[str, list] = find_entity_id_field_name(service.get_entity_type())
-        entity_id: any
+    return convert_request_response_to_json_response(response_body)
 
-        # Si el id field es un listado significa que es una tabla con más de una clave primaria y no debería pasar
-        # utilizar un rest service para modificar sus datos, deberían venir siempre como dato adicional de una
-        # tabla principal
-        if isinstance(id_field_name, list):
-            raise ValueError(f"Entity type {service.get_entity_type().__name__} not allowed for direct update.")
 
-        if id_field_name in request_body.request_object:
-            entity_id = request_body.request_object[id_field_name]
-        else:
-            raise KeyError("You have to specify the id of the entity on the request.")
+@db_service_blueprint.route('/update', methods=['POST'])
+def update():
+    """
+    Servicio Rest para actualizar entidades en la base de datos.
+    """
+    return _update()
 
-        # Usuario de última modificación
-        if has_create_update_user[1]:
-            request_body.request_object["usuario_ult_mod"] = {"id": current_user_id}
 
-        # Actualizo los campos pasados como parámetro.
-        entity_to_be_updated = service.update_fields(registry_id=entity_id, values_dict=request_body.request_object)
+@db_rest_fn
+def _delete(request_body: DBRequestBody, service: BaseService):
+    """
+    Función interna delete.
+    :param request_body:
+    :param service:
+    :return: Response.
+    """
+    # Objeto query_object creado a partir del request_object
+    entity_to_be_deleted = deserialize_model(request_body.request_object, service.get_entity_type())
+
+    # Para entidades con una sola pk basta con el id para el delete, sin pasar la entidad al servicio. Sólo si el
+    # servicio no redefine delete, para no saltarse la lógica que pudiera tener.
+    id_field_name: Union[str, list] = find_entity_id_field_name(service.get_entity_type())
+    if type(service).delete is BaseService.delete and not isinstance(id_field_name, list) and \
+            id_field_name in request_body.request_object:
+        service.delete_by_id(request_body.request_object[id_field_name])
+    else:
+        service.delete(entity_to_be_deleted)
 
-        json_result = f"'{entity_to_be_updated}' has been updated."
-        response_body = RequestResponse(response_object=json_result, success=True,
-                                        status_code=EnumHttpResponseStatusCodes.OK.value)
+    json_result = f"'{entity_to_be_deleted}' has been deleted."
 
-        return convert_request_response_to_json_response(response_body)
+    response_body = RequestResponse(response_object=json_result, success=True,
+                                    status_code=_OK_STATUS_CODE)
 
-    return __update()
+    return convert_request_response_to_json_response(response_body)
 
 
 @db_service_blueprint.route('/delete', methods=['POST'])
@@ -141,29 +168,45 @@ def delete():
     """
     Servicio Rest para eliminar entidades en la base de datos.
     """
+    return _delete()
 
-    @db_rest_fn
-    def __delete(*args, **kwargs): # noqa
-        """
-        Función interna delete.
-        :param request_body:
-        :param service:
-        :return: Response.
-        """
-        request_body: DBRequestBody = kwargs["request_body"]
-        service: BaseService = kwargs["service"]
-
-        # Objeto query_object creado a partir del request_object
-        entity_to_be_deleted = deserialize_model(request_body.request_object, service.get_entity_type())
-        service.delete(entity_to_be_deleted)
 
-        json_result = f"'{entity_to_be_deleted}' has been deleted."
-        response_body = RequestResponse(response_object=json_result, success=True,
-                                        status_code=EnumHttpResponseStatusCodes.OK.value)
+@db_rest_fn
+def _select(request_body: DBRequestBody, service: BaseService):
+    """
+    Función interior select.
+    :param request_body:
+    :param service:
+    :return: Response.
+    """
+    result: list
+
+    # Objeto query_object creado a partir del request_object
+    query_object = JsonQuery(request_body.request_object)
+
+    # Si la consulta ha llegado con field_clauses, es una selección de campos individuales. Si no ha llegado con
+    # field_clauses, es una selección de entidades.
+    if query_object.fields:
+        result = service.select_fields(filter_clauses=query_object.filters, order_by_clauses=query_object.order,
+                                       join_clauses=query_object.joins,
+                                       field_clauses=query_object.fields, group_by_clauses=query_object.group_by,
+                                       limit=query_object.limit, offset=query_object.offset)
+    else:
+        result = service.select(filter_clauses=query_object.filters, order_by_clauses=query_object.order,
+                                join_clauses=query_object.joins, limit=query_object.limit,
+                                offset=query_object.offset)
+
+    # Sin resultados la respuesta es constante
+    if not result:
+        return make_json_response(_EMPTY_SELECT_RESPONSE_BODY, _OK_STATUS_CODE)
 
-        return convert_request_response_to_json_response(response_body)
+    # En ambos casos el resultado son modelos de la base de datos, así que hay que serializarlos
+    json_result: List[dict] = [serialize_model(r) for r in result]
 
-    return __delete()
+    response_body: RequestResponse = RequestResponse(response_object=json_result, success=True,
+                                                     status_code=_OK_STATUS_CODE)
+
+    return convert_request_response_to_json_response(response_body)
 
 
 @db_service_blueprint.route('/select', methods=['POST'])
@@ -171,86 +214,34 @@ def select():
     """
     Servicio Rest para seleccionar entidades de la base de datos.
     """
-
-    @db_rest_fn
-    def __select(*args, **kwargs): # noqa
-        """
-        Función interior select.
-        :param request_body:
-        :param service:
-        :return: Response.
-        """
-        # En realidad estas dos variables podrían ser los parámetros de la función... pero si no utilizo
-        # "*args, **kwargs" el debugger no sabe llegar hasta aquí sin hacer step into desde el decorador.
-        request_body: DBRequestBody = kwargs["request_body"]
-        service: BaseService = kwargs["service"]
-
-        result: list
-
-        # Consulta
-        json_result: List[dict] = []
-
-        # Objeto query_object creado a partir del request_object
-        query_object = JsonQuery(request_body.request_object)
-
-        # Si la consulta ha llegado con field_clauses, es una selección de campos individuales. Si no ha llegado con
-        # field_clauses, es una selección de entidades.
-        if query_object.fields:
-            result = service.select_fields(filter_clauses=query_object.filters, order_by_clauses=query_object.order,
-                                           join_clauses=query_object.joins,
-                                           field_clauses=query_object.fields, group_by_clauses=query_object.group_by,
-                                           limit=query_object.limit, offset=query_object.offset)
-            if result:
-                for r in result:
-                    # Creo instancias de la entidad y la serializo
-                    json_result.append(serialize_model(r))
-        else:
-            result = service.select(filter_clauses=query_object.filters, order_by_clauses=query_object.order,
-                                    join_clauses=query_object.joins, limit=query_object.limit,
-                                    offset=query_object.offset)
-            # en este caso, el resultado hay que serializarlo al ser modelos de la base de datos
-            if result:
-                for r in result:
-                    json_result.append(serialize_model(r))
-
-        response_body: RequestResponse = RequestResponse(response_object=json_result, success=True,
-                                                         status_code=EnumHttpResponseStatusCodes.OK.value)
-
-        return convert_request_response_to_json_response(response_body)
-
-    return __select()
+    return _select()
 
 
-@db_service_blueprint.route('/count', methods=['POST'])
-def count():
+@db_rest_fn
+def _count(request_body: DBRequestBody, service: BaseService):
     """
-    Servicio Rest para seleccionar entidades de la base de datos.
+    Función interior select.
+    :param request_body:
+    :param service:
+    :return: Response.
     """
+    result: int
 
-    @db_rest_fn
-    def __count(*args, **kwargs): # noqa
-        """
-        Función interior select.
-        :param request_body:
-        :param service:
-        :return: Response.
-        """
-        # En realidad estas dos variables podrían ser los parámetros de la función... pero si no utilizo
-        # "*args, **kwargs" el debugger no sabe llegar hasta aquí sin hacer step into desde el decorador.
-        request_body: DBRequestBody = kwargs["request_body"]
-        service: BaseService = kwargs["service"]
-
-        result: int
+    # Objeto query_object creado a partir del request_object
+    query_object = JsonQuery(request_body.request_object)
 
-        # Objeto query_object creado a partir del request_object
-        query_object = JsonQuery(request_body.request_object)
+    # Utilizo count_by_filtered_query del servicio asociado
+    result = service.count_by_filtered_query(filter_clauses=query_object.filters, join_clauses=query_object.joins)
 
-        # Utilizo count_by_filtered_query del servicio asociado
-        result = service.count_by_filtered_query(filter_clauses=query_object.filters, join_clauses=query_object.joins)
+    response_body: RequestResponse = RequestResponse(response_object=result, success=True,
+                                                     status_code=_OK_STATUS_CODE)
 
-        response_body: RequestResponse = RequestResponse(response_object=result, success=True,
-                                                         status_code=EnumHttpResponseStatusCodes.OK.value)
+    return convert_request_response_to_json_response(response_body)
 
-        return convert_request_response_to_json_response(response_body)
 
-    return __count()
+@db_service_blueprint.route('/count', methods=['POST'])
+def count():
+    """
+    Servicio Rest para seleccionar entidades de la base de datos.
+    """
+    return _count()
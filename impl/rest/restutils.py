@@ -1,7 +1,6 @@
-import sys
-import traceback
-from functools import wraps
-from typing import Tuple, Union
+import logging
+from functools import wraps, lru_cache
+from typing import Tuple, List, Dict
 
 from flask import request
 from flask_jwt_extended import verify_jwt_in_request
@@ -11,13 +10,63 @@ from core.rest.apitools import RequestResponse, RequestBody, EnumHttpResponseSta
     convert_request_response_to_json_response
 from core.service.servicetools import ServiceException, EnumServiceExceptionCodes
 from core.utils.i18nutils import translate, prepare_translations
-from core.utils.jsonutils import encode_object_to_json, decode_object_from_json
+from core.utils.jsonutils import decode_json
 from impl.rest import servicehandler
 
 
-# Preparar traducciones de la aplicación
-_TRANSLATIONS: dict = prepare_translations(language_list=["es_ES", "en_GB"], mo_file_name="base", dir_name="resources")
-"""Traducciones i18n."""
+_logger: logging.Logger = logging.getLogger(__name__)
+"""Logger del módulo."""
+
+_BAD_REQUEST_STATUS_CODE: int = EnumHttpResponseStatusCodes.BAD_REQUEST.value
+"""Código de estado de las respuestas de error."""
+
+_LANGUAGES: List[str] = ["es_ES", "en_GB"]
+"""Idiomas de la aplicación."""
+
+_OTHER_ERROR_I18N_KEY: str = "i18n_error_serviceException_otherError"
+"""Clave i18n para los errores de servicio sin un código conocido."""
+
+_ERROR_CODE_I18N_KEYS: Dict[EnumServiceExceptionCodes, str] = {
+    EnumServiceExceptionCodes.VALUE_ERROR: "i18n_error_serviceException_valueError",
+    EnumServiceExceptionCodes.AUTHORIZATION_ERROR: "i18n_error_serviceException_authorizationError",
+    EnumServiceExceptionCodes.CONNECTION_ERROR: "i18n_error_serviceException_connectionError",
+    EnumServiceExceptionCodes.DUPLICITY_ERROR: "i18n_error_serviceException_duplicityError",
+    EnumServiceExceptionCodes.QUERY_ERROR: "i18n_error_serviceException_queryError",
+    EnumServiceExceptionCodes.SERVICE_ERROR: "i18n_error_serviceException_serviceError"
+}
+"""Clave i18n del mensaje de error de cada código de error de servicio."""
+
+
+@lru_cache(maxsize=1)
+def _get_translations() -> dict:
+    """
+    Devuelve las traducciones i18n de la aplicación. Sólo se necesitan para los mensajes de error, así que los ficheros
+    de traducción se leen la primera vez que se piden y no al importar el módulo.
+    :return: Traducciones i18n.
+    """
+    return prepare_translations(language_list=_LANGUAGES, mo_file_name="base", dir_name="resources")
+
+
+@lru_cache(maxsize=None)
+def _get_error_message(error_code: EnumServiceExceptionCodes, locale: str) -> str:
+    """
+    Traduce el mensaje de error asociado a un código de error de servicio. El mensaje sólo depende del código y del
+    idioma, así que se traduce una sola vez para cada combinación.
+    :param error_code: Código de error.
+    :param locale: Idioma para traducción.
+    :return: Mensaje de error traducido.
+    """
+    return translate(key=_ERROR_CODE_I18N_KEYS.get(error_code, _OTHER_ERROR_I18N_KEY), languages=_get_translations(),
+                     locale_iso=locale)
+
+
+_REST_SERVICE_SUFFIX: str = "RestService"
+"""Sufijo de los nombres de los servicios declarados en servicehandler."""
+
+_REST_SERVICES: dict = {name[:-len(_REST_SERVICE_SUFFIX)]: getattr(servicehandler, name)
+                        for name in dir(servicehandler) if name.endswith(_REST_SERVICE_SUFFIX)}
+"""Servicios de servicehandler indexados por el nombre de la entidad a la que dan servicio. Los servicios son únicos
+durante toda la vida de la aplicación, así que se resuelven una sola vez."""
 
 
 def handle_service_exception(e: ServiceException, locale: str) -> Tuple[str, str]:
@@ -27,27 +76,12 @@ def handle_service_exception(e: ServiceException, locale: str) -> Tuple[str, str
     :param locale: Idioma para traducción.
     :return: Mensaje de error.
     """
-    # Comprobar el código de error asociado a la excepción
-    error: str
-    if e.error_code == EnumServiceExceptionCodes.VALUE_ERROR:
-        error = translate(key="i18n_error_serviceException_valueError", languages=_TRANSLATIONS, locale_iso=locale)
-    elif e.error_code == EnumServiceExceptionCodes.AUTHORIZATION_ERROR:
-        error = translate(key="i18n_error_serviceException_authorizationError", languages=_TRANSLATIONS,
-                          locale_iso=locale)
-    elif e.error_code == EnumServiceExceptionCodes.CONNECTION_ERROR:
-        error = translate(key="i18n_error_serviceException_connectionError", languages=_TRANSLATIONS, locale_iso=locale)
-    elif e.error_code == EnumServiceExceptionCodes.DUPLICITY_ERROR:
-        error = translate(key="i18n_error_serviceException_duplicityError", languages=_TRANSLATIONS, locale_iso=locale)
-    elif e.error_code == EnumServiceExceptionCodes.QUERY_ERROR:
-        error = translate(key="i18n_error_serviceException_queryError", languages=_TRANSLATIONS, locale_iso=locale)
-    elif e.error_code == EnumServiceExceptionCodes.SERVICE_ERROR:
-        error = translate(key="i18n_error_serviceException_serviceError", languages=_TRANSLATIONS, locale_iso=locale)
-    else:
-        error = translate(key="i18n_error_serviceException_otherError", languages=_TRANSLATIONS, locale_iso=locale)
+    # Mensaje asociado al código de error de la excepción
+    error: str = _get_error_message(e.error_code, locale)
 
-    # Primero obtengo el mensaje de error traducido (si no hay traducción usará devuelve el mensaje normal de la
-    # excepción)
-    error = f"{error}\n{e.get_translated_message(translations=_TRANSLATIONS, locale=locale)}"
+    # Luego añado el mensaje de error traducido de la excepción (si no hay traducción usará devuelve el mensaje normal
+    # de la excepción)
+    error = f"{error}\n{e.get_translated_message(translations=_get_translations(), locale=locale)}"
 
     # Si la excepción tiene una excepción origen, añadir la traza
     trace: str
@@ -60,107 +94,117 @@ def handle_service_exception(e: ServiceException, locale: str) -> Tuple[str, str
     return error, trace
 
 
-def rest_fn(function):
+def _get_request_json() -> dict:
     """
-    Decorador para implementaciones de rest controller.
-    :param function: Función a ejecutar.
-    :return: Decorador
+    Decodifica el cuerpo json de la petición actual. Igual que get_json(force=True), no exige la cabecera
+    Content-Type: application/json, pero lo decodifica con orjson si está disponible en lugar del decodificador de
+    Flask.
+    :return: dict
     """
+    return decode_json(request.get_data(cache=False))
 
-    @wraps(function)
-    def decorator(*args, **kwargs):
-        locale: str = "en_GB"
-        request_error: Union[str, None] = None
 
-        try:
-            # Obtengo el objeto enviado por json con la petición
-            json_format = encode_object_to_json(request.get_json(force=True))
-            # Luego transformo el string json a un objeto RequestBody, pasando el tipo como parámetro
-            request_body: RequestBody = decode_object_from_json(json_format, RequestBody)
+def _build_error_response(request_error: str):
+    """
+    Crea la respuesta json de una petición fallida.
+    :param request_error: Mensaje de error.
+    :return: Respuesta válida para el solicitante en formato json.
+    """
+    response_body: RequestResponse = RequestResponse(response_object=request_error, success=False,
+                                                     status_code=_BAD_REQUEST_STATUS_CODE)
+    return convert_request_response_to_json_response(response_body)
 
-            # Añado los parámetros a la función
-            kwargs['request_body'] = request_body
 
-            return function(*args, **kwargs)
-        except ServiceException as s:
-            error, trace = handle_service_exception(s, locale)
-            print(trace, file=sys.stderr)
-            request_error = error
-        except Exception as e:
-            print(traceback.print_exc())
-            request_error = str(e)
-        finally:
-            if request_error is not None:
-                response_body: RequestResponse = RequestResponse(response_object=request_error, success=False,
-                                                                 status_code=EnumHttpResponseStatusCodes.BAD_REQUEST.
-                                                                 value)
-                return convert_request_response_to_json_response(response_body)
+def _get_rest_service(entity: str):
+    """
+    Devuelve el servicio de la entidad objetivo de una petición.
+    :param entity: Nombre de la entidad.
+    :return: Servicio de la entidad.
+    """
+    if entity is None or not entity:
+        raise ValueError("You have to specify a target entity.")
 
-    return decorator
+    service = _REST_SERVICES.get(entity)
+    if service is None:
+        raise AttributeError(f"Entity {entity} does not exist.")
 
+    return service
 
-def db_rest_fn(function):
+
+def _rest_decorator(function, require_jwt: bool, need_service: bool):
     """
-    Decorador para tener un cuerpo común para todas las funciones del módulo de bases de datos.
+    Cuerpo común de los decoradores de los rest controllers: decodifica la petición, llama a la función y convierte
+    cualquier error en una respuesta json.
     :param function: Función a ejecutar.
+    :param require_jwt: Si True, se verifica que se ha enviado el token de autenticación.
+    :param need_service: Si True, la petición es un DBRequestBody y la función recibe como parámetros posicionales el
+    propio DBRequestBody y el servicio de la entidad objetivo. Si False, la función recibe el RequestBody en el
+    parámetro request_body.
     :return: Decorador
     """
 
     @wraps(function)
     def decorator(*args, **kwargs):
         locale: str = "en_GB"
-        request_error: Union[str, None] = None
 
         try:
             # id_token = request.headers['Authorization'].split(' ').pop()
             # Verificar que se ha enviado el token de autenticación
-            verify_jwt_in_request()
+            if require_jwt:
+                verify_jwt_in_request()
             # claims = get_jwt()
 
-            # Obtengo el objeto enviado por json con la petición
-            json_format = encode_object_to_json(request.get_json(force=True))
-            # Luego transformo el string json a un objeto RequestBody, pasando el tipo como parámetro
-            request_body: DBRequestBody = decode_object_from_json(json_format, DBRequestBody)
-
-            # En función de la entidad seleccionada, cargar el servicio correspodiente
-            if request_body.entity is None or not request_body.entity:
-                raise ValueError("You have to specify a target entity.")
+            # Obtengo el objeto enviado por json con la petición como diccionario y construyo directamente el
+            # RequestBody a partir de él
+            request_json: dict = _get_request_json()
 
-            try:
-                service = getattr(servicehandler, f"{request_body.entity}RestService")
-            except AttributeError as e1:
-                raise AttributeError(f"Entity {request_body.entity} does not exist.") from e1
+            if need_service:
+                # En función de la entidad seleccionada, cargar el servicio correspodiente
+                request_body: DBRequestBody = DBRequestBody(**request_json)
+                return function(request_body, _get_rest_service(request_body.entity))
 
             # Añado los parámetros a la función
-            kwargs['request_body'] = request_body
-            kwargs['service'] = service
-
+            kwargs['request_body'] = RequestBody(**request_json)
             return function(*args, **kwargs)
         except ServiceException as s:
             error, trace = handle_service_exception(s, locale)
-            print(trace, file=sys.stderr)
-            request_error = error
+            _logger.error("Service error in %s\n%s", function.__name__, trace)
+            return _build_error_response(error)
         except Exception as e:
-            print(traceback.print_exc())
-            request_error = str(e)
-        finally:
-            if request_error is not None:
-                response_body: RequestResponse = RequestResponse(response_object=request_error, success=False,
-                                                                 status_code=EnumHttpResponseStatusCodes.BAD_REQUEST.
-                                                                 value)
-                return convert_request_response_to_json_response(response_body)
+            _logger.exception("Unhandled error in %s", function.__name__)
+            return _build_error_response(str(e))
 
     return decorator
 
 
+def rest_fn(function):
+    """
+    Decorador para implementaciones de rest controller.
+    :param function: Función a ejecutar.
+    :return: Decorador
+    """
+    return _rest_decorator(function, require_jwt=False, need_service=False)
+
+
+def db_rest_fn(function):
+    """
+    Decorador para tener un cuerpo común para todas las funciones del módulo de bases de datos.
+    :param function: Función a ejecutar. Recibe como parámetros posicionales el DBRequestBody de la petición y el
+    servicio de la entidad objetivo.
+    :return: Decorador
+    """
+    return _rest_decorator(function, require_jwt=True, need_service=True)
+
+
+@lru_cache(maxsize=None)
 def does_entity_have_create_update_user(entity_type: type(BaseEntity)) -> Tuple[bool, bool]:
     """
     Devuelve una tupla de dos boolean, comprobando si el tipo tiene los atributos "usuario_creacion" y
-    "usuario_ult_mod", devolviendo True o False para cada caso en ese orden.
+    "usuario_ult_mod", devolviendo True o False para cada caso en ese orden. Las relaciones mapeadas son atributos de
+    la clase, así que no hace falta instanciar la entidad; el resultado es fijo para cada tipo y se cachea.
     :param entity_type: BaseEntity.
     :return: Tuple[bool, bool]
     """
-    o = entity_type()
-    result: Tuple[bool, bool] = (hasattr(o, "usuario_creacion"), hasattr(o, "usuario_ult_mod"))
+    result: Tuple[bool, bool] = (hasattr(entity_type, "usuario_creacion"), hasattr(entity_type, "usuario_ult_mod"))
     return result
 
@@ -1,7 +1,8 @@
-from copy import deepcopy
-from typing import List
+import hmac
+from functools import cached_property
+from typing import Tuple, Union
 
-from core.dao.daotools import EnumFilterTypes, FilterClause, FieldClause
+from core.dao.daotools import JoinClause, EnumJoinTypes
 from core.service.service import BaseService, ServiceFactory
 from core.service.servicetools import service_method, ServiceException, EnumServiceExceptionCodes
 from core.utils.passwordutils import check_password_using_bcrypt, hash_password_using_bcrypt
@@ -12,6 +13,10 @@ from impl.model.tipocliente import TipoCliente
 from impl.model.usuario import Usuario
 
 
+_CLIENTE_LOAD_JOINS: Tuple[JoinClause, ...] = (JoinClause("tipo_cliente", EnumJoinTypes.INNER_JOIN, True),)
+"""Joins de ClienteServiceImpl.load. No cambian entre llamadas, así que se crean una sola vez."""
+
+
 class ClienteServiceImpl(BaseService):
     """Implementación del service de clientes."""
 
@@ -20,13 +25,9 @@ class ClienteServiceImpl(BaseService):
 
     @service_method
     def load(self, registry_id: int) -> Rol:
-        cliente: Cliente = super().load(registry_id)
-
-        # Carga de tipo de cliente
-        tipos_cliente_service = ServiceFactory.get_service(TipoClienteServiceImpl)
-        cliente.tipo_cliente = tipos_cliente_service.find_by_id(cliente.tipoclienteid)
-
-        return cliente
+        # Carga del cliente con su tipo de cliente en la misma consulta. Es una relación n a 1, así que el join no
+        # multiplica las filas del cliente.
+        return self.find_by_id(registry_id, _CLIENTE_LOAD_JOINS)
 
     @service_method
     def create(self, entity: Cliente):
@@ -105,24 +106,19 @@ class UsuarioServiceImpl(BaseService):
             else:
                 # Si tiene id, busco el password antiguo en la base de datos para comprobar si realmente ha cambiado
                 # usando el comparador de bcrypt. Dado que bcrypt va a hashear el password de otra forma, no quiero
-                # modificar el valor en la base de datos salvo que realmente sea otro password.
-                filters: List[FilterClause] = [FilterClause(field_name="id", filter_type=EnumFilterTypes.EQUALS,
-                                                            object_to_compare=usuario.id)]
-                fields: List[FieldClause] = [FieldClause(field_name="password")]
-                result: List[Usuario] = self.select_fields(field_clauses=fields, filter_clauses=filters,
-                                                           offset=0, limit=1)
-
-                if result and len(result) > 0:
-                    usuario_old = result[0]
+                # modificar el valor en la base de datos salvo que realmente sea otro password. Sólo necesito el
+                # password, así que lo consulto directamente como escalar.
+                password_old: Union[str, None] = self._dao.find_password_by_id(usuario.id)
 
+                if password_old is not None:
                     # Si el password del usuario ya estuviese encriptado en este punto, sería igual que el original
-                    if usuario.password != usuario_old.password:
-                        if not check_password_using_bcrypt(usuario.password, usuario_old.password):
+                    if not hmac.compare_digest(usuario.password.encode('utf-8'), password_old.encode('utf-8')):
+                        if not check_password_using_bcrypt(usuario.password, password_old):
                             usuario.password = hash_password_using_bcrypt(usuario.password)
                         else:
                             # Mantener el password original en caso contrario (el password del usuario es el mismo
                             # pero está desencriptado)
-                            usuario.password = usuario_old.password
+                            usuario.password = password_old
 
     @service_method
     def create(self, entity: Usuario):
@@ -146,23 +142,19 @@ class UsuarioServiceImpl(BaseService):
         :return: Usuario.
         """
         # Busco el usuario
-        filters: List[FilterClause] = [
-            FilterClause(field_name="username", filter_type=EnumFilterTypes.EQUALS, object_to_compare=username)
-        ]
-
-        usuarios: List[Usuario] = self.select(filter_clauses=filters, limit=1)
+        usuario: Union[Usuario, None] = self._dao.find_by_username(username)
 
         # Si no encuentra el usuario, lanzar excepción
-        if not usuarios:
+        if usuario is None:
             raise ServiceException(message="User does not exist.", i18n_key=("i18n_auth_error_username", [username]),
                                    error_code=EnumServiceExceptionCodes.AUTHORIZATION_ERROR)
 
         # Validar password
-        if not check_password_using_bcrypt(password, usuarios[0].password):
+        if not check_password_using_bcrypt(password, usuario.password):
             raise ServiceException(message="Invalid password.",
                                    error_code=EnumServiceExceptionCodes.AUTHORIZATION_ERROR)
 
-        return usuarios[0]
+        return usuario
 
 
 class RolServiceImpl(BaseService):
@@ -174,13 +166,20 @@ class RolServiceImpl(BaseService):
     def __init__(self):
         super().__init__(dao=RolDaoImpl())
 
+    @cached_property
+    def _usuario_rol_service(self) -> "UsuarioRolServiceImpl":
+        """
+        Service de usuarios-roles. Los servicios son únicos, así que se resuelve una sola vez.
+        :return: UsuarioRolServiceImpl
+        """
+        return ServiceFactory.get_service(UsuarioRolServiceImpl)
+
     @service_method
     def load(self, registry_id: int) -> Rol:
         rol: Rol = super().load(registry_id)
 
         # Carga de los usuarios_roles
-        usuario_rol_service = ServiceFactory.get_service(UsuarioRolServiceImpl)
-        rol.usuarios_roles = usuario_rol_service.find_by_rol_id(registry_id)
+        rol.usuarios_roles = self._usuario_rol_service.find_by_rol_id(registry_id)
 
         return rol
 
@@ -191,16 +190,15 @@ class RolServiceImpl(BaseService):
         :param registry: Registro a modificar.
         :return: None
         """
-        # Hago una copia de los usuarios asociados y vacío la lista para evitar problemas.
-        usuarios_roles: list = deepcopy(registry.usuarios_roles)
-        registry.usuarios_transient = []
+        # El update del dao sólo vuelca las columnas del rol, no toca la relación, así que basta con una copia
+        # superficial de la lista de usuarios asociados.
+        usuarios_roles: list = list(registry.usuarios_roles)
 
         self._dao.update(registry)
 
         # Actualizo la relación many-to-many
         if usuarios_roles:
-            usuario_rol_service = ServiceFactory.get_service(UsuarioRolServiceImpl)
-            usuario_rol_service.update_usuarios_roles_by_rol(registry, usuarios_roles)
+            self._usuario_rol_service.update_usuarios_roles_by_rol(registry, usuarios_roles)
 
 
 class UsuarioRolServiceImpl(BaseService):
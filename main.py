@@ -1,10 +1,14 @@
+import atexit
+import logging
 from datetime import timedelta
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 
 from core.dao.basedao import BaseDao
-from core.utils.fileutils import read_section_in_ini_file
+from core.utils.fileutils import read_all_sections_in_ini_file
 
 from flask import Flask
 
@@ -12,15 +16,40 @@ from impl.rest.dbrestcontroller import db_service_blueprint
 from impl.rest.userrestcontroller import user_service_blueprint
 
 
-def create_app():
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Configura el logging de la aplicación. Los hilos de las peticiones sólo encolan los registros; la escritura en
+    stderr la hace el hilo del QueueListener, así un pico de errores no bloquea las peticiones en la escritura.
+    :param level: Nivel de logging.
+    :return: QueueListener arrancado.
+    """
+    log_queue: SimpleQueue = SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Vaciar la cola antes de salir
+    atexit.register(listener.stop)
+
+    return listener
+
+
+def create_app(jwt_config: dict):
     """
     Crea la app de flask.
+    :param jwt_config: Sección JWT del fichero de configuración.
     :return: app
     """
     app_ = Flask(__name__)
 
     # Configuración Json Web Token
-    app_.config["JWT_SECRET_KEY"] = read_section_in_ini_file(file_name="config", section="JWT")["jwt_secret_key"]
+    app_.config["JWT_SECRET_KEY"] = jwt_config["jwt_secret_key"]
     app_.config["JWT_TOKEN_LOCATION"] = ["headers"]
     app_.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=1)
 
@@ -36,15 +65,20 @@ def create_app():
 
 
 if __name__ == '__main__':
+    # Logging asíncrono
+    configure_logging()
+
+    # Leer todas las secciones del fichero de configuración de una vez, comprobando que están las necesarias
+    config = read_all_sections_in_ini_file(file_name="config", required_sections=("DB", "REST", "JWT"))
+
     # Configurar Dao desde fichero ini
-    db_config = read_section_in_ini_file(file_name="config", section="DB")
-    BaseDao.set_db_config_values(**db_config)
+    BaseDao.set_db_config_values(**config["DB"])
 
     # Configurar app
-    app_config = read_section_in_ini_file(file_name="config", section="REST")
+    app_config = config["REST"]
 
     # Aplicación flask
-    app = create_app()
+    app = create_app(config["JWT"])
 
     jwt = JWTManager(app)
 